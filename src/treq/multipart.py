@@ -55,6 +55,10 @@ class MultiPartProducer:
         unicode and file objects stacked on bottom (to produce a human readable
         form-data request)
 
+    :ivar _headers: The rendered headers of each part, in the same order as
+        `_fields`. They are rendered once here rather than every time the
+        request is written, including when its length is calculated.
+
     :ivar _cooperate: A method like `Cooperator.cooperate` which is used to
         schedule all reads.
 
@@ -73,6 +77,7 @@ class MultiPartProducer:
         cooperator: task.Cooperator = cast(task.Cooperator, task),
     ) -> None:
         self._fields = _sorted_by_type(_converted(fields))
+        self._headers = [_render_headers(name, value) for name, value in self._fields]
         self._cooperate = cooperator.cooperate
 
         if not boundary:
@@ -170,7 +175,7 @@ class MultiPartProducer:
         request including the encoded objects
         and writes them to the consumer for each time it is iterated.
         """
-        for index, (name, value) in enumerate(self._fields):
+        for index, (_, value) in enumerate(self._fields):
             # We don't write the CRLF of the first boundary:
             # HTTP request headers are already separated with CRLF
             # from the request body, another newline is possible
@@ -187,47 +192,32 @@ class MultiPartProducer:
             # This is very important.
             # proper boundary is "CRLF--boundary-valueCRLF"
             consumer.write((CRLF if index != 0 else b"") + self._getBoundary() + CRLF)
-            yield self._writeField(name, value, consumer)
+            yield self._writeField(self._headers[index], value, consumer)
 
         consumer.write(CRLF + self._getBoundary(final=True) + CRLF)
 
     def _writeField(
-        self, name: str, value: _FieldValue, consumer: _Consumer
+        self, headers: bytes, value: _FieldValue, consumer: _Consumer
     ) -> Optional[Deferred]:
         if isinstance(value, bytes):
-            self._writeString(name, value, consumer)
+            self._writeString(headers, value, consumer)
             return None
         else:
-            filename, content_type, producer = value
-            return self._writeFile(name, filename, content_type, producer, consumer)
+            _, _, producer = value
+            return self._writeFile(headers, producer, consumer)
 
-    def _writeString(self, name: str, value: bytes, consumer: _Consumer) -> None:
-        cdisp = _Header(b"Content-Disposition", b"form-data")
-        cdisp.add_param(b"name", name)
-        consumer.write(bytes(cdisp) + CRLF + CRLF)
+    def _writeString(self, headers: bytes, value: bytes, consumer: _Consumer) -> None:
+        consumer.write(headers)
         consumer.write(value)
         self._currentProducer = None
 
     def _writeFile(
         self,
-        name: str,
-        filename: str,
-        content_type: str,
+        headers: bytes,
         producer: IBodyProducer,
         consumer: _Consumer,
     ) -> "Optional[Deferred[None]]":
-        cdisp = _Header(b"Content-Disposition", b"form-data")
-        cdisp.add_param(b"name", name)
-        if filename:
-            cdisp.add_param(b"filename", filename)
-
-        consumer.write(bytes(cdisp) + CRLF)
-        consumer.write(bytes(_Header(b"Content-Type", content_type)) + CRLF)
-        if producer.length != UNKNOWN_LENGTH:
-            consumer.write(
-                bytes(_Header(b"Content-Length", str(producer.length))) + CRLF
-            )
-        consumer.write(CRLF)
+        consumer.write(headers)
 
         if isinstance(consumer, _LengthConsumer):
             consumer.write(producer.length)
@@ -243,6 +233,27 @@ class MultiPartProducer:
             return cast("Deferred[None]", d.addCallback(unset))
 
 
+def _render_headers(name: str, value: _FieldValue) -> bytes:
+    """
+    Render the headers of a single part, including the blank line which
+    separates them from the part body.
+    """
+    cdisp = _Header(b"Content-Disposition", b"form-data")
+    cdisp.add_param(b"name", name)
+    if isinstance(value, bytes):
+        return bytes(cdisp) + CRLF + CRLF
+
+    filename, content_type, producer = value
+    if filename:
+        cdisp.add_param(b"filename", filename)
+
+    headers = bytes(cdisp) + CRLF
+    headers += bytes(_Header(b"Content-Type", content_type)) + CRLF
+    if producer.length != UNKNOWN_LENGTH:
+        headers += bytes(_Header(b"Content-Length", str(producer.length))) + CRLF
+    return headers + CRLF
+
+
 def _escape(value: Union[str, bytes]) -> str:
     """
     This function prevents header values from corrupting the request,
@@ -341,13 +352,14 @@ class _LengthConsumer:
             return
         assert isinstance(self.length, int)
 
-        if value == UNKNOWN_LENGTH:
+        # Almost every write is bytes, so check for that first.
+        if isinstance(value, bytes):
+            self.length += len(value)
+        elif value == UNKNOWN_LENGTH:
             self.length = cast(_UnknownLength, UNKNOWN_LENGTH)
-        elif isinstance(value, int):
-            self.length += value
         else:
-            assert isinstance(value, bytes)
-            self.length += len(value)
+            assert isinstance(value, int)
+            self.length += value
 
 
 class _Header:
@@ -1,20 +1,204 @@
 # Copyright (c) Twisted Matrix Laboratories.
 # See LICENSE for details.
 
-from typing import cast, AnyStr
+import re
+from collections import deque
+from typing import cast
 
 from io import BytesIO
 
 from .._multipart import MultipartParser
 from twisted.trial import unittest
+from zope.interface import implementer
 from zope.interface.verify import verifyObject
 
 from twisted.internet import task
+from twisted.internet.defer import Deferred, succeed
+from twisted.internet.interfaces import IConsumer
 from twisted.internet.testing import StringTransport
 from twisted.web.client import FileBodyProducer
 from twisted.web.iweb import UNKNOWN_LENGTH, IBodyProducer
 
-from treq.multipart import MultiPartProducer, _LengthConsumer
+from treq._types import _FilesType
+from treq import multipart
+from treq.multipart import (
+    MultiPartProducer, _FieldValue, _LengthConsumer, _render_headers)
+
+
+# Bare LFs, i.e. those not already part of a CRLF pair.
+_LF_RE = re.compile(rb"(?<!\r)\n")
+
+
+def _crlf(value: bytes) -> bytes:
+    """
+    Convert the LF line endings of an expected multipart body literal into
+    the CRLF line endings required on the wire.
+    """
+    return _LF_RE.sub(b"\r\n", value)
+
+
+_EXPECTED_START_PRODUCING = _crlf(b"""--heyDavid
+Content-Disposition: form-data; name="field"; filename="file name"
+Content-Type: text/hello-world
+Content-Length: 12
+
+Hello, World
+--heyDavid--
+""")
+
+_EXPECTED_TWO_FIELDS = _crlf(b"""--heyDavid
+Content-Disposition: form-data; name="afield"
+
+just a string
+
+--heyDavid
+Content-Disposition: form-data; name="bfield"
+
+another string
+--heyDavid--
+""")
+
+_EXPECTED_FIELDS_AND_ATTACHMENT = _crlf(b"""--heyDavid
+Content-Disposition: form-data; name="bfield"
+
+just a string
+
+--heyDavid
+Content-Disposition: form-data; name="cfield"
+
+another string
+--heyDavid
+Content-Disposition: form-data; name="afield"; filename="file name"
+Content-Type: text/hello-world
+Content-Length: 15
+
+my lovely bytes
+--heyDavid--
+""")
+
+_EXPECTED_MULTIPLE_FIELDS_AND_ATTACHMENTS = _crlf(b"""--heyDavid
+Content-Disposition: form-data; name="bfield"
+
+another string
+--heyDavid
+Content-Disposition: form-data; name="cfield"
+
+just a string
+
+--heyDavid
+Content-Disposition: form-data; name="afield"; filename="af"
+Content-Type: text/xml
+Content-Length: 17
+
+my lovely bytes22
+--heyDavid
+Content-Disposition: form-data; name="efield"; filename="ef"
+Content-Type: text/html
+Content-Length: 16
+
+my lovely bytes2
+--heyDavid
+Content-Disposition: form-data; name="xfield"; filename="xf"
+Content-Type: text/json
+Content-Length: 18
+
+my lovely bytes219
+--heyDavid--
+""")
+
+_EXPECTED_MISSING_ATTACHMENT_NAME = _crlf(b"""--heyDavid
+Content-Disposition: form-data; name="field"
+Content-Type: image/jpeg
+Content-Length: 15
+
+my lovely bytes
+--heyDavid--
+""")
+
+_EXPECTED_UNICODE_STRING = _crlf("""--heyDavid
+Content-Disposition: form-data; name="afield"
+
+Это моя строчечка
+
+--heyDavid--
+""".encode("utf-8"))
+
+_EXPECTED_UNICODE_ATTACHMENT_NAME = _crlf("""--heyDavid
+Content-Disposition: form-data; name="field"; filename="Так себе имя.jpg"
+Content-Type: image/jpeg
+Content-Length: 15
+
+my lovely bytes
+--heyDavid--
+""".encode("utf-8"))
+
+_EXPECTED_NEW_LINES_IN_PARAMS = _crlf("""--heyDavid
+Content-Disposition: form-data; name="field"; filename="oops.jpg"
+Content-Type: image/jpeg
+Content-Length: 15
+
+my lovely bytes
+--heyDavid--
+""".encode("utf-8"))
+
+_EXPECTED_HEADERS_RENDERED_ONCE = _crlf(b"""--heyDavid
+Content-Disposition: form-data; name="afield"
+
+just a string
+--heyDavid
+Content-Disposition: form-data; name="bfield"; filename="bf"
+Content-Type: text/plain
+Content-Length: 5
+
+bytes
+--heyDavid--
+""")
+
+
+@implementer(IConsumer)
+class _BytesSink:
+    """
+    A minimal consumer which accumulates everything written to it in a
+    L{bytearray}, avoiding the copy made by C{BytesIO.getvalue}.
+    """
+    __slots__ = ("buf",)
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    def registerProducer(self, producer: object, streaming: bool) -> None:
+        pass
+
+    def unregisterProducer(self) -> None:
+        pass
+
+    def write(self, data: bytes) -> None:
+        self.buf.extend(data)
+
+
+@implementer(IBodyProducer)
+class _EagerBodyProducer:
+    """
+    An L{IBodyProducer} which writes all of its data in a single call to
+    C{startProducing}, without scheduling any work on a L{Cooperator}.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self.length = len(data)
+
+    def startProducing(self, consumer: IConsumer) -> "Deferred[None]":
+        consumer.write(self._data)
+        return succeed(None)
+
+    def stopProducing(self) -> None:
+        pass
+
+    def pauseProducing(self) -> None:
+        pass
+
+    def resumeProducing(self) -> None:
+        pass
 
 
 class MultiPartProducerTestCase(unittest.TestCase):
@@ -23,7 +207,8 @@ class MultiPartProducerTestCase(unittest.TestCase):
     with post parameters, converts them to multipart/form-data format
     and feeds them to an L{IConsumer}.
     """
-    def _termination(self):
+    @staticmethod
+    def _termination():
         """
         This method can be used as the C{terminationPredicateFactory} for a
         L{Cooperator}.  It returns a predicate which immediately returns
@@ -38,32 +223,48 @@ class MultiPartProducerTestCase(unittest.TestCase):
         Create a L{Cooperator} hooked up to an easily controlled, deterministic
         scheduler to use with L{MultiPartProducer}.
         """
-        self._scheduled = []
+        self._scheduled = deque()
         self.cooperator = task.Cooperator(
             self._termination, self._scheduled.append)
 
     def getOutput(self, producer, with_producer=False):
         """
         A convenience function to consume and return output.
+
+        The output is returned as a L{bytearray}, which compares equal to
+        the equivalent L{bytes}.
         """
-        consumer = output = BytesIO()
+        sink = _BytesSink()
 
-        producer.startProducing(consumer)
+        producer.startProducing(sink)
 
         while self._scheduled:
-            self._scheduled.pop(0)()
+            self._scheduled.popleft()()
 
         if with_producer:
-            return (output.getvalue(), producer)
+            return (sink.buf, producer)
         else:
-            return output.getvalue()
+            return sink.buf
 
-    def newLines(self, value: AnyStr) -> AnyStr:
+    def _makeHelloProducer(self):
+        """
+        Create a L{MultiPartProducer} with a single file field reading from
+        a L{BytesIO} over C{b"hello, world!"}.
 
-        if isinstance(value, str):
-            return value.replace(u"\n", u"\r\n")
-        else:
-            return value.replace(b"\n", b"\r\n")
+        @return: A 3-tuple of the producer, the input file and a
+            L{StringTransport} to use as its consumer.
+        """
+        inputFile = BytesIO(b"hello, world!")
+        consumer = StringTransport()
+        producer = MultiPartProducer({
+            "field": (
+                "file name",
+                "text/hello-world",
+                FileBodyProducer(
+                    inputFile,
+                    cooperator=self.cooperator))
+        }, cooperator=self.cooperator, boundary=b"heyDavid")
+        return producer, inputFile, consumer
 
     def test_interface(self):
         """
@@ -144,15 +345,10 @@ class MultiPartProducerTestCase(unittest.TestCase):
         file to the given L{IConsumer} and returns a L{Deferred} which fires
         when they have all been written.
         """
-        consumer = output = StringTransport()
-
-        # We historically accepted bytes for field names and continue to allow
-        # it for compatibility, but the types don't permit it because it makes
-        # them even more complicated and awful. So here we verify that that works.
-        field = cast(str, b"field")
+        consumer = _BytesSink()
 
         producer = MultiPartProducer({
-            field: ("file name", "text/hello-world", FileBodyProducer(
+            "field": ("file name", "text/hello-world", FileBodyProducer(
                 BytesIO(b"Hello, World"),
                 cooperator=self.cooperator))
         }, cooperator=self.cooperator, boundary=b"heyDavid")
@@ -162,40 +358,40 @@ class MultiPartProducerTestCase(unittest.TestCase):
         iterations = 0
         while self._scheduled:
             iterations += 1
-            self._scheduled.pop(0)()
+            self._scheduled.popleft()()
 
         self.assertTrue(iterations > 1)
-        self.assertEqual(self.newLines(b"""--heyDavid
-Content-Disposition: form-data; name="field"; filename="file name"
-Content-Type: text/hello-world
-Content-Length: 12
-
-Hello, World
---heyDavid--
-"""), output.value())
+        self.assertEqual(_EXPECTED_START_PRODUCING, consumer.buf)
         self.assertEqual(None, self.successResultOf(complete))
 
+    def test_bytesFieldName(self) -> None:
+        """
+        A field name given as UTF-8 L{bytes} is rendered as though it had
+        been given as L{str}.
+        """
+        # We historically accepted bytes for field names and continue to allow
+        # it for compatibility, but the types don't permit it because it makes
+        # them even more complicated and awful. So here we verify that that works.
+        field = cast(str, b"field")
+
+        output = self.getOutput(
+            MultiPartProducer({
+                field: ("file name", "text/hello-world",
+                        _EagerBodyProducer(b"Hello, World")),
+            }, cooperator=self.cooperator, boundary=b"heyDavid"))
+
+        self.assertEqual(_EXPECTED_START_PRODUCING, output)
+
     def test_inputClosedAtEOF(self) -> None:
         """
         When L{MultiPartProducer} reaches end-of-file on the input
         file given to it, the input file is closed.
         """
-        inputFile = BytesIO(b"hello, world!")
-        consumer = StringTransport()
-
-        producer = MultiPartProducer({
-            "field": (
-                "file name",
-                "text/hello-world",
-                FileBodyProducer(
-                    inputFile,
-                    cooperator=self.cooperator))
-        }, cooperator=self.cooperator, boundary=b"heyDavid")
-
+        producer, inputFile, consumer = self._makeHelloProducer()
         producer.startProducing(consumer)
 
         while self._scheduled:
-            self._scheduled.pop(0)()
+            self._scheduled.popleft()()
 
         self.assertTrue(inputFile.closed)
 
@@ -222,7 +418,7 @@ Hello, World
         complete = producer.startProducing(StringTransport())
 
         while self._scheduled:
-            self._scheduled.pop(0)()
+            self._scheduled.popleft()()
 
         self.failureResultOf(complete).trap(IOError)
 
@@ -233,22 +429,12 @@ Hello, World
         calling C{resumeProducing} and closes the input file but does
         not cause the L{Deferred} returned by C{startProducing} to fire.
         """
-        inputFile = BytesIO(b"hello, world!")
-        consumer = BytesIO()
-
-        producer = MultiPartProducer({
-            "field": (
-                "file name",
-                "text/hello-world",
-                FileBodyProducer(
-                    inputFile,
-                    cooperator=self.cooperator))
-        }, cooperator=self.cooperator, boundary=b"heyDavid")
+        producer, inputFile, consumer = self._makeHelloProducer()
         complete = producer.startProducing(consumer)
-        self._scheduled.pop(0)()
+        self._scheduled.popleft()()
         producer.stopProducing()
         self.assertTrue(inputFile.closed)
-        self._scheduled.pop(0)()
+        self._scheduled.popleft()()
         self.assertNoResult(complete)
 
     def test_pauseProducing(self) -> None:
@@ -256,19 +442,9 @@ Hello, World
         L{MultiPartProducer.pauseProducing} temporarily suspends writing bytes
         from the input file to the given L{IConsumer}.
         """
-        inputFile = BytesIO(b"hello, world!")
-        consumer = output = StringTransport()
-
-        producer = MultiPartProducer({
-            "field": (
-                "file name",
-                "text/hello-world",
-                FileBodyProducer(
-                    inputFile,
-                    cooperator=self.cooperator))
-        }, cooperator=self.cooperator, boundary=b"heyDavid")
-        complete = producer.startProducing(consumer)
-        self._scheduled.pop(0)()
+        producer, inputFile, output = self._makeHelloProducer()
+        complete = producer.startProducing(output)
+        self._scheduled.popleft()()
 
         currentValue = output.value()
         self.assertTrue(currentValue)
@@ -278,7 +454,7 @@ Hello, World
         # though the only task is paused, there's still a scheduled call.  If
         # this were to go away because Cooperator became smart enough to cancel
         # this call in this case, that would be fine.
-        self._scheduled.pop(0)()
+        self._scheduled.popleft()()
 
         # Since the producer is paused, no new data should be here.
         self.assertEqual(output.value(), currentValue)
@@ -290,25 +466,14 @@ Hello, World
         from the input file to the given L{IConsumer} after it was previously
         paused with L{MultiPartProducer.pauseProducing}.
         """
-        inputFile = BytesIO(b"hello, world!")
-        consumer = output = StringTransport()
-
-        producer = MultiPartProducer({
-            "field": (
-                "file name",
-                "text/hello-world",
-                FileBodyProducer(
-                    inputFile,
-                    cooperator=self.cooperator))
-        }, cooperator=self.cooperator, boundary=b"heyDavid")
-
-        producer.startProducing(consumer)
-        self._scheduled.pop(0)()
+        producer, inputFile, output = self._makeHelloProducer()
+        producer.startProducing(output)
+        self._scheduled.popleft()()
         currentValue = output.value()
         self.assertTrue(currentValue)
         producer.pauseProducing()
         producer.resumeProducing()
-        self._scheduled.pop(0)()
+        self._scheduled.popleft()()
         # make sure we started producing new data after resume
         self.assertTrue(len(currentValue) < len(output.value()))
 
@@ -322,13 +487,7 @@ Hello, World
             }, cooperator=self.cooperator, boundary=b"heyDavid"),
             with_producer=True)
 
-        expected = self.newLines(u"""--heyDavid
-Content-Disposition: form-data; name="afield"
-
-Это моя строчечка
-
---heyDavid--
-""".encode("utf-8"))
+        expected = _EXPECTED_UNICODE_STRING
         self.assertEqual(producer.length, len(expected))
         self.assertEqual(expected, output)
 
@@ -358,149 +517,66 @@ Content-Disposition: form-data; name="afield"
         If byte string is passed as a param and we don't know
         the encoding, fail early to prevent corrupted form posts
         """
-        # unknown key
-        self.assertRaises(
-            ValueError,
-            MultiPartProducer, {
-                (1, 2): BytesIO(b"yo"),
-            },
-            cooperator=self.cooperator, boundary=b"heyDavid")
-
-        # tuple length
-        self.assertRaises(
-            ValueError,
-            MultiPartProducer, {
-                "a": (1,),
-            },
-            cooperator=self.cooperator, boundary=b"heyDavid")
-
-        # unknown value type
-        self.assertRaises(
-            ValueError,
-            MultiPartProducer, {
-                "a": {"a": "b"},
-            },
-            cooperator=self.cooperator, boundary=b"heyDavid")
+        badFields = [
+            # unknown key
+            {(1, 2): BytesIO(b"yo")},
+            # tuple length
+            {"a": (1,)},
+            # unknown value type
+            {"a": {"a": "b"}},
+        ]
+        for fields in badFields:
+            self.assertRaises(
+                ValueError,
+                MultiPartProducer, fields,
+                cooperator=self.cooperator, boundary=b"heyDavid")
+
+    def assertRendersAs(self, fields: _FilesType, expected: bytes) -> None:
+        """
+        Assert that a L{MultiPartProducer} over C{fields} produces exactly
+        C{expected}, and that its C{length} matches.
+        """
+        output, producer = self.getOutput(
+            MultiPartProducer(
+                fields, cooperator=self.cooperator, boundary=b"heyDavid"),
+            with_producer=True)
+
+        self.assertEqual(producer.length, len(expected))
+        self.assertEqual(expected, output)
 
     def test_twoFields(self) -> None:
         """
         Make sure multiple fields are rendered properly.
         """
-        output = self.getOutput(
-            MultiPartProducer({
-                "afield": "just a string\r\n",
-                "bfield": "another string"
-            }, cooperator=self.cooperator, boundary=b"heyDavid"))
-
-        self.assertEqual(self.newLines(b"""--heyDavid
-Content-Disposition: form-data; name="afield"
-
-just a string
-
---heyDavid
-Content-Disposition: form-data; name="bfield"
-
-another string
---heyDavid--
-"""), output)
+        self.assertRendersAs([
+            ("afield", "just a string\r\n"),
+            ("bfield", "another string"),
+        ], _EXPECTED_TWO_FIELDS)
 
     def test_fieldsAndAttachment(self):
         """
         Make sure multiple fields are rendered properly.
         """
-        output, producer = self.getOutput(
-            MultiPartProducer({
-                "bfield": "just a string\r\n",
-                "cfield": "another string",
-                "afield": (
-                    "file name",
-                    "text/hello-world",
-                    FileBodyProducer(
-                        inputFile=BytesIO(b"my lovely bytes"),
-                        cooperator=self.cooperator))
-            }, cooperator=self.cooperator, boundary=b"heyDavid"),
-            with_producer=True)
-
-        expected = self.newLines(b"""--heyDavid
-Content-Disposition: form-data; name="bfield"
-
-just a string
-
---heyDavid
-Content-Disposition: form-data; name="cfield"
-
-another string
---heyDavid
-Content-Disposition: form-data; name="afield"; filename="file name"
-Content-Type: text/hello-world
-Content-Length: 15
-
-my lovely bytes
---heyDavid--
-""")
-        self.assertEqual(producer.length, len(expected))
-        self.assertEqual(output, expected)
+        self.assertRendersAs([
+            ("bfield", "just a string\r\n"),
+            ("cfield", "another string"),
+            ("afield", (
+                "file name",
+                "text/hello-world",
+                _EagerBodyProducer(b"my lovely bytes"))),
+        ], _EXPECTED_FIELDS_AND_ATTACHMENT)
 
     def test_multipleFieldsAndAttachments(self):
         """
         Make sure multiple fields, attachments etc are rendered properly.
         """
-        output, producer = self.getOutput(
-            MultiPartProducer({
-                "cfield": "just a string\r\n",
-                "bfield": "another string",
-                "efield": (
-                    "ef",
-                    "text/html",
-                    FileBodyProducer(
-                        inputFile=BytesIO(b"my lovely bytes2"),
-                        cooperator=self.cooperator)),
-                "xfield": (
-                    "xf",
-                    "text/json",
-                    FileBodyProducer(
-                        inputFile=BytesIO(b"my lovely bytes219"),
-                        cooperator=self.cooperator)),
-                "afield": (
-                    "af",
-                    "text/xml",
-                    FileBodyProducer(
-                        inputFile=BytesIO(b"my lovely bytes22"),
-                        cooperator=self.cooperator))
-            }, cooperator=self.cooperator, boundary=b"heyDavid"),
-            with_producer=True)
-
-        expected = self.newLines(b"""--heyDavid
-Content-Disposition: form-data; name="bfield"
-
-another string
---heyDavid
-Content-Disposition: form-data; name="cfield"
-
-just a string
-
---heyDavid
-Content-Disposition: form-data; name="afield"; filename="af"
-Content-Type: text/xml
-Content-Length: 17
-
-my lovely bytes22
---heyDavid
-Content-Disposition: form-data; name="efield"; filename="ef"
-Content-Type: text/html
-Content-Length: 16
-
-my lovely bytes2
---heyDavid
-Content-Disposition: form-data; name="xfield"; filename="xf"
-Content-Type: text/json
-Content-Length: 18
-
-my lovely bytes219
---heyDavid--
-""")
-        self.assertEqual(producer.length, len(expected))
-        self.assertEqual(output, expected)
+        self.assertRendersAs([
+            ("cfield", "just a string\r\n"),
+            ("bfield", "another string"),
+            ("efield", ("ef", "text/html", _EagerBodyProducer(b"my lovely bytes2"))),
+            ("xfield", ("xf", "text/json", _EagerBodyProducer(b"my lovely bytes219"))),
+            ("afield", ("af", "text/xml", _EagerBodyProducer(b"my lovely bytes22"))),
+        ], _EXPECTED_MULTIPLE_FIELDS_AND_ATTACHMENTS)
 
     def test_unicodeAttachmentName(self):
         """
@@ -511,22 +587,12 @@ my lovely bytes219
                 "field": (
                     u'Так себе имя.jpg',
                     "image/jpeg",
-                    FileBodyProducer(
-                        inputFile=BytesIO(b"my lovely bytes"),
-                        cooperator=self.cooperator
-                    )
+                    _EagerBodyProducer(b"my lovely bytes")
                 )
             }, cooperator=self.cooperator, boundary=b"heyDavid"),
             with_producer=True)
 
-        expected = self.newLines(u"""--heyDavid
-Content-Disposition: form-data; name="field"; filename="Так себе имя.jpg"
-Content-Type: image/jpeg
-Content-Length: 15
-
-my lovely bytes
---heyDavid--
-""".encode("utf-8"))
+        expected = _EXPECTED_UNICODE_ATTACHMENT_NAME
         self.assertEqual(len(expected), producer.length)
         self.assertEqual(expected, output)
 
@@ -539,23 +605,13 @@ my lovely bytes
                 "field": (
                     None,
                     "image/jpeg",
-                    FileBodyProducer(
-                        inputFile=BytesIO(b"my lovely bytes"),
-                        cooperator=self.cooperator,
-                    )
+                    _EagerBodyProducer(b"my lovely bytes")
                 )
             }, cooperator=self.cooperator,
                 boundary=b"heyDavid"),
             with_producer=True)
 
-        expected = self.newLines(b"""--heyDavid
-Content-Disposition: form-data; name="field"
-Content-Type: image/jpeg
-Content-Length: 15
-
-my lovely bytes
---heyDavid--
-""")
+        expected = _EXPECTED_MISSING_ATTACHMENT_NAME
         self.assertEqual(len(expected), producer.length)
         self.assertEqual(expected, output)
 
@@ -568,54 +624,78 @@ my lovely bytes
                 "field": (
                     u'\r\noops.j\npg',
                     "image/jp\reg\n",
-                    FileBodyProducer(
-                        inputFile=BytesIO(b"my lovely bytes"),
-                        cooperator=self.cooperator
-                    )
+                    _EagerBodyProducer(b"my lovely bytes")
                 )
             }, cooperator=self.cooperator,
                 boundary=b"heyDavid"
             )
         )
 
-        self.assertEqual(self.newLines(u"""--heyDavid
-Content-Disposition: form-data; name="field"; filename="oops.jpg"
-Content-Type: image/jpeg
-Content-Length: 15
+        self.assertEqual(_EXPECTED_NEW_LINES_IN_PARAMS, output)
 
-my lovely bytes
---heyDavid--
-""".encode("utf-8")), output)
+    def test_headersRenderedOnce(self) -> None:
+        """
+        The headers of each part are rendered once, when the producer is
+        created, and reused both to calculate its length and to produce it.
+        """
+        calls = []
+
+        def countingRenderHeaders(name: str, value: _FieldValue) -> bytes:
+            calls.append(name)
+            return _render_headers(name, value)
+
+        self.patch(multipart, "_render_headers", countingRenderHeaders)
+
+        fields: _FilesType = [
+            ("bfield", ("bf", "text/plain", _EagerBodyProducer(b"bytes"))),
+            ("afield", "just a string"),
+        ]
+        output, producer = self.getOutput(
+            MultiPartProducer(
+                fields, cooperator=self.cooperator, boundary=b"heyDavid"),
+            with_producer=True)
+
+        self.assertEqual(["afield", "bfield"], calls)
+        self.assertEqual(producer.length, len(_EXPECTED_HEADERS_RENDERED_ONCE))
+        self.assertEqual(_EXPECTED_HEADERS_RENDERED_ONCE, output)
 
     def test_worksWithMultipart(self):
         """
         Make sure the stuff we generated can actually be parsed by the
         `multipart` module.
         """
-        output = self.getOutput(
-            MultiPartProducer([
-                ("cfield", "just a string\r\n"),
-                ("cfield", "another string"),
-                ("efield", ('ef', "text/html", FileBodyProducer(
-                            inputFile=BytesIO(b"my lovely bytes2"),
-                            cooperator=self.cooperator,
-                            ))),
-                ("xfield", ('xf', "text/json", FileBodyProducer(
-                            inputFile=BytesIO(b"my lovely bytes219"),
-                            cooperator=self.cooperator,
-                            ))),
-                ("afield", ('af', "text/xml", FileBodyProducer(
-                            inputFile=BytesIO(b"my lovely bytes22"),
-                            cooperator=self.cooperator,
-                            )))
-            ], cooperator=self.cooperator, boundary=b"heyDavid"
-            )
-        )
+        producer = MultiPartProducer([
+            ("cfield", "just a string\r\n"),
+            ("cfield", "another string"),
+            ("efield", ('ef', "text/html", FileBodyProducer(
+                        inputFile=BytesIO(b"my lovely bytes2"),
+                        cooperator=self.cooperator,
+                        ))),
+            ("xfield", ('xf', "text/json", FileBodyProducer(
+                        inputFile=BytesIO(b"my lovely bytes219"),
+                        cooperator=self.cooperator,
+                        ))),
+            ("afield", ('af', "text/xml", FileBodyProducer(
+                        inputFile=BytesIO(b"my lovely bytes22"),
+                        cooperator=self.cooperator,
+                        )))
+        ], cooperator=self.cooperator, boundary=b"heyDavid")
+
+        # Produce straight into the stream the parser will read from, rather
+        # than copying the body out of one buffer and into another.
+        stream = BytesIO()
+        producer.startProducing(stream)
+
+        while self._scheduled:
+            self._scheduled.popleft()()
+
+        contentLength = stream.tell()
+        stream.seek(0)
 
         form = MultipartParser(
-            stream=BytesIO(output),
+            stream=stream,
             boundary=b"heyDavid",
-            content_length=len(output),
+            content_length=contentLength,
         )
 
         self.assertEqual(
@@ -657,3 +737,25 @@ class LengthConsumerTestCase(unittest.TestCase):
         self.assertEqual(consumer.length, 0)
         consumer.write(a)
         self.assertEqual(consumer.length, 89)
+
+    def test_mixedWritesUpdateCounter(self):
+        """
+        Byte strings and ints may be interleaved, and both contribute to the
+        internal counter.
+        """
+        consumer = _LengthConsumer()
+        consumer.write(b"abc")
+        consumer.write(10)
+        consumer.write(b"de")
+        self.assertEqual(consumer.length, 15)
+
+    def test_unknownLengthIsFinal(self):
+        """
+        Once C{UNKNOWN_LENGTH} is written, further writes do not change the
+        length.
+        """
+        consumer = _LengthConsumer()
+        consumer.write(b"abc")
+        consumer.write(UNKNOWN_LENGTH)
+        consumer.write(b"de")
+        self.assertEqual(consumer.length, UNKNOWN_LENGTH)